@@ -1,22 +1,38 @@
 import logging
+from contextlib import asynccontextmanager
 from typing import Optional
 
+import redis.asyncio as redis
 from fastapi import Depends, FastAPI, Request
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import FileResponse, ORJSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from logging_config import setup_logging
 from routers import auth, bot
-from services.auth import SESSION_SECRET, get_optional_user
-from services.bot import bot_service
-from starlette.middleware.sessions import SessionMiddleware
+from services.auth import create_github_client, get_optional_user
+from services.redis import get_redis, redis_client, wait_for_redis
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Trading Bot API", version="1.0.0")
 
-# Add session middleware
-app.add_middleware(SessionMiddleware, secret_key=SESSION_SECRET)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Check Redis once at startup rather than at module import, and refuse to
+    # serve traffic if it is unreachable
+    await wait_for_redis()
+    app.state.redis = redis_client
+    app.state.github_client = create_github_client()
+    yield
+    await app.state.github_client.aclose()
+    await redis_client.aclose()
+
+
+app = FastAPI(
+    title="Trading Bot API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # Include routers
 app.include_router(auth.router)
@@ -31,10 +47,11 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 async def serve_spa(
     request: Request, user: Optional[dict] = Depends(get_optional_user)
 ):
-    session_cookie = request.cookies.get("session")
-    cookie_display = session_cookie[:20] if session_cookie else None
-    logger.info(f"Main route - Session cookie: {cookie_display}...")
-    logger.info(f"Main route - User: {user}")
+    logger.info(
+        "Main route - Session cookie present: %s",
+        "user_session" in request.cookies,
+    )
+    logger.info("Main route - User: %s", user)
     if not user:
         return RedirectResponse(url="/auth/login", status_code=302)
     return FileResponse("static/index.html")
@@ -42,6 +59,10 @@ async def serve_spa(
 
 # Health check endpoint
 @app.get("/health")
-async def health_check():
-    redis_status = bot_service.get_health_status()
+async def health_check(redis_conn: redis.Redis = Depends(get_redis)):
+    try:
+        await redis_conn.ping()
+        redis_status = "connected"
+    except redis.RedisError:
+        redis_status = "disconnected"
     return {"status": "healthy", "redis": redis_status, "service": "api"}
@@ -1,6 +1,9 @@
+import html
 import logging
+from string import Template
 from typing import Optional
 
+import httpx
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
 from services.auth import (
@@ -8,10 +11,13 @@ from services.auth import (
     GITHUB_CLIENT_SECRET,
     OAuthService,
     SessionManager,
+    clear_oauth_state_cookie,
     clear_session_cookie,
     create_login_url,
+    get_github_client,
     get_optional_user,
     require_auth,
+    set_oauth_state_cookie,
     set_session_cookie,
 )
 
@@ -19,6 +25,21 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+_ACCESS_DENIED_PAGE = Template(
+    """
+    <html>
+    <head><title>Access Denied</title></head>
+    <body>
+        <h1>Access Denied</h1>
+        <p>${detail}</p>
+        <p>Please contact an administrator if you believe
+        this is an error.</p>
+        <a href="/">Return to Home</a>
+    </body>
+    </html>
+    """
+)
+
 
 @router.get("/login")
 async def login(request: Request):
@@ -35,50 +56,42 @@ async def github_login(request: Request):
     if not GITHUB_CLIENT_ID or not GITHUB_CLIENT_SECRET:
         raise HTTPException(status_code=500, detail="GitHub OAuth not configured")
 
-    login_url = create_login_url(request)
-    return RedirectResponse(url=login_url)
+    login_url, state = await create_login_url()
+    response = RedirectResponse(url=login_url)
+    set_oauth_state_cookie(response, state)
+    return response
 
 
 @router.get("/callback")
-async def auth_callback(request: Request, code: str, state: str):
+async def auth_callback(
+    request: Request,
+    code: str,
+    state: str,
+    github_client: httpx.AsyncClient = Depends(get_github_client),
+):
     """Handle GitHub OAuth callback"""
     if not GITHUB_CLIENT_ID or not GITHUB_CLIENT_SECRET:
         raise HTTPException(status_code=500, detail="GitHub OAuth not configured")
 
-    if "oauth_state" not in request.session:
+    cookie_state = request.cookies.get("oauth_state")
+    if not cookie_state:
         raise HTTPException(status_code=400, detail="Missing OAuth state")
 
-    session_state = request.session["oauth_state"]
-
-    if request.session.get("oauth_code_used") == code:
-        return RedirectResponse(url="/", status_code=302)
-
     try:
-        session_id = OAuthService.process_oauth_callback(code, state, session_state)
+        session_id = await OAuthService.process_oauth_callback(
+            github_client, code, state, cookie_state
+        )
 
         response = RedirectResponse(url="/", status_code=302)
         set_session_cookie(response, session_id)
-
-        request.session.pop("oauth_state", None)
-        request.session["oauth_code_used"] = code
+        clear_oauth_state_cookie(response)
 
         return response
 
     except HTTPException as e:
         if e.status_code == 403:
             return HTMLResponse(
-                content=f"""
-                <html>
-                <head><title>Access Denied</title></head>
-                <body>
-                    <h1>Access Denied</h1>
-                    <p>{e.detail}</p>
-                    <p>Please contact an administrator if you believe
-                    this is an error.</p>
-                    <a href="/">Return to Home</a>
-                </body>
-                </html>
-                """,
+                content=_ACCESS_DENIED_PAGE.substitute(detail=html.escape(e.detail)),
                 status_code=403,
             )
         raise
@@ -99,7 +112,7 @@ async def logout(
     """Logout user and destroy session"""
     session_id = request.cookies.get("user_session")
     if session_id:
-        SessionManager.delete_session(session_id)
+        await SessionManager.delete_session(session_id)
 
     clear_session_cookie(response)
     response.delete_cookie("session", path="/")
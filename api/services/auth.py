@@ -1,22 +1,27 @@
-import json
+import base64
 import logging
 import os
-import secrets
-from typing import Dict, Optional
+import threading
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlencode
 
-import redis
-import requests
+import httpx
+import redis.asyncio as redis
+from cachetools import TTLCache
 from fastapi import Cookie, Depends, HTTPException, Request, Response
 
+from services.redis import redis_client
+
 logger = logging.getLogger(__name__)
 
 # Configuration
 GITHUB_CLIENT_ID = os.getenv("GITHUB_CLIENT_ID")
 GITHUB_CLIENT_SECRET = os.getenv("GITHUB_CLIENT_SECRET")
-ALLOWED_GITHUB_USERS = os.getenv("ALLOWED_GITHUB_USERS", "").split(",")
-SESSION_SECRET = os.getenv("SESSION_SECRET")
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+ALLOWED_GITHUB_USERS = frozenset(
+    user.strip()
+    for user in os.getenv("ALLOWED_GITHUB_USERS", "").split(",")
+    if user.strip()
+)
 # Handle Railway's domain format (without protocol) or full URLs
 _base_url = os.getenv("BASE_URL", "http://localhost:8000")
 if not _base_url.startswith(("http://", "https://")):
@@ -33,28 +38,40 @@ GITHUB_AUTHORIZE_URL = "https://github.com/login/oauth/authorize"
 GITHUB_TOKEN_URL = "https://github.com/login/oauth/access_token"
 GITHUB_API_BASE_URL = "https://api.github.com"
 
-# Initialize Redis connection
-try:
-    redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-    redis_client.ping()  # Test connection
-    logger.info(f"Auth service connected to Redis at {REDIS_URL}")
-except redis.ConnectionError:
-    logger.error(f"Auth service failed to connect to Redis at {REDIS_URL}")
-    redis_client = None
+
+# Static part of the GitHub authorize URL; only the state varies per login.
+# Use explicit BASE_URL instead of request-based URL construction
+# This ensures consistent redirect URIs regardless of proxy headers
+_LOGIN_URL_PREFIX = (
+    f"{GITHUB_AUTHORIZE_URL}?"
+    + urlencode(
+        {
+            "client_id": GITHUB_CLIENT_ID,
+            "redirect_uri": f"{BASE_URL.rstrip('/')}/auth/callback",
+            "scope": "user:email",
+        }
+    )
+    + "&state="
+)
 
 
 class SessionManager:
     """Manages user sessions in Redis"""
 
     SESSION_EXPIRE_TIME = 24 * 60 * 60  # 24 hours in seconds
+    CACHE_TTL = 30  # seconds a session is served from the local cache
+
+    # Per-worker cache of active sessions in front of Redis. Entries expire
+    # after CACHE_TTL, so the Redis TTL is still refreshed on a cache miss at
+    # most once per CACHE_TTL while a session is in use. Logout only evicts
+    # the entry in the worker that handled it, so other workers may keep
+    # accepting the session for up to CACHE_TTL seconds.
+    _cache: TTLCache = TTLCache(maxsize=10_000, ttl=CACHE_TTL)
 
     @classmethod
-    def create_session(cls, user_data: Dict) -> str:
+    async def create_session(cls, user_data: Dict) -> str:
         """Create a new session and return session ID"""
-        if not redis_client:
-            raise HTTPException(status_code=500, detail="Redis not available")
-
-        session_id = secrets.token_urlsafe(32)
+        session_id = _token_urlsafe()
         session_key = f"session:{session_id}"
 
         session_data = {
@@ -64,39 +81,78 @@ class SessionManager:
             "name": user_data.get("name"),
             "email": user_data.get("email"),
         }
+        # Redis hashes cannot hold None, so missing profile fields are omitted
+        mapping = {k: v for k, v in session_data.items() if v is not None}
 
-        redis_client.setex(
-            session_key, cls.SESSION_EXPIRE_TIME, json.dumps(session_data)
-        )
+        try:
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.hset(session_key, mapping=mapping)
+            pipe.expire(session_key, cls.SESSION_EXPIRE_TIME)
+            await pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"Error creating session: {e}")
+            raise HTTPException(status_code=500, detail="Redis not available") from e
 
         logger.info(f"Created session for user: {session_data['username']}")
         return session_id
 
+    @staticmethod
+    def _decode_session(raw: Dict[bytes, bytes]) -> Dict[str, str]:
+        """Decode a session hash returned by Redis"""
+        return {k.decode(): v.decode() for k, v in raw.items()}
+
     @classmethod
-    def get_session(cls, session_id: str) -> Optional[Dict]:
+    async def get_session(cls, session_id: str) -> Optional[Dict]:
         """Get session data by session ID"""
-        if not redis_client or not session_id:
+        if not session_id:
             return None
 
         session_key = f"session:{session_id}"
         try:
-            session_data = redis_client.get(session_key)
+            session_data = await redis_client.hgetall(session_key)
             if session_data:
-                return json.loads(session_data)
-        except (redis.RedisError, json.JSONDecodeError) as e:
+                return cls._decode_session(session_data)
+        except (redis.RedisError, ValueError) as e:
             logger.error(f"Error getting session {session_id}: {e}")
 
         return None
 
     @classmethod
-    def delete_session(cls, session_id: str) -> bool:
+    async def get_and_extend(cls, session_id: str) -> Optional[Dict]:
+        """Get session data and refresh its expiry in a single round trip"""
+        if not session_id:
+            return None
+
+        cached = cls._cache.get(session_id)
+        if cached is not None:
+            # A copy, so callers can't modify the cached entry
+            return dict(cached)
+
+        session_key = f"session:{session_id}"
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.hgetall(session_key)
+            pipe.expire(session_key, cls.SESSION_EXPIRE_TIME)
+            session_data, _ = await pipe.execute()
+            if session_data:
+                user_data = cls._decode_session(session_data)
+                cls._cache[session_id] = user_data
+                return dict(user_data)
+        except (redis.RedisError, ValueError) as e:
+            logger.error(f"Error getting session {session_id}: {e}")
+
+        return None
+
+    @classmethod
+    async def delete_session(cls, session_id: str) -> bool:
         """Delete a session"""
-        if not redis_client or not session_id:
+        if not session_id:
             return False
 
+        cls._cache.pop(session_id, None)
         session_key = f"session:{session_id}"
         try:
-            result = redis_client.delete(session_key)
+            result = await redis_client.delete(session_key)
             if result:
                 logger.info(f"Deleted session: {session_id}")
             return bool(result)
@@ -104,30 +160,50 @@ class SessionManager:
             logger.error(f"Error deleting session {session_id}: {e}")
             return False
 
+
+class OAuthService:
+    """OAuth authentication service"""
+
+    STATE_EXPIRE_TIME = 10 * 60  # 10 minutes in seconds
+
     @classmethod
-    def extend_session(cls, session_id: str) -> bool:
-        """Extend session expiry time"""
-        if not redis_client or not session_id:
-            return False
+    async def store_state(cls, state: str) -> None:
+        """Store a single-use OAuth state value in Redis"""
+        try:
+            await redis_client.setex(f"oauth:state:{state}", cls.STATE_EXPIRE_TIME, "1")
+        except redis.RedisError as e:
+            logger.error(f"Error storing OAuth state: {e}")
+            raise HTTPException(status_code=500, detail="Redis not available") from e
 
-        session_key = f"session:{session_id}"
+    @staticmethod
+    async def consume_state(state: str) -> bool:
+        """Atomically consume an OAuth state value, returning whether it existed"""
         try:
-            return redis_client.expire(session_key, cls.SESSION_EXPIRE_TIME)
+            return await redis_client.getdel(f"oauth:state:{state}") is not None
         except redis.RedisError as e:
-            logger.error(f"Error extending session {session_id}: {e}")
+            logger.error(f"Error consuming OAuth state: {e}")
             return False
 
-
-class OAuthService:
-    """OAuth authentication service"""
+    @classmethod
+    async def mark_code_used(cls, code: str) -> bool:
+        """Record an OAuth code as used, returning False if it already was"""
+        try:
+            return bool(
+                await redis_client.set(
+                    f"oauth:code:{code}", "1", nx=True, ex=cls.STATE_EXPIRE_TIME
+                )
+            )
+        except redis.RedisError as e:
+            logger.error(f"Error recording OAuth code: {e}")
+            raise HTTPException(status_code=503, detail="Redis not available") from e
 
     @staticmethod
-    def exchange_code_for_token(code: str) -> str:
+    async def exchange_code_for_token(client: httpx.AsyncClient, code: str) -> str:
         """Exchange OAuth code for access token"""
         try:
-            token_response = requests.post(
-                "https://github.com/login/oauth/access_token",
-                {
+            token_response = await client.post(
+                GITHUB_TOKEN_URL,
+                data={
                     "client_id": GITHUB_CLIENT_ID,
                     "client_secret": GITHUB_CLIENT_SECRET,
                     "code": code,
@@ -135,8 +211,7 @@ class OAuthService:
                 headers={"Accept": "application/json"},
             )
 
-            logger.info(f"Token response status: {token_response.status_code}")
-            logger.info(f"Token response body: {token_response.text}")
+            logger.debug("Token response status: %s", token_response.status_code)
 
             token_data = token_response.json()
             access_token = token_data.get("access_token")
@@ -158,18 +233,18 @@ class OAuthService:
 
             return access_token
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Network error during token exchange: {e}")
             raise HTTPException(
                 status_code=500, detail="Failed to communicate with GitHub"
             ) from e
 
     @staticmethod
-    def get_user_info(access_token: str) -> Dict:
+    async def get_user_info(client: httpx.AsyncClient, access_token: str) -> Dict:
         """Get user information from GitHub API"""
         try:
-            user_response = requests.get(
-                "https://api.github.com/user",
+            user_response = await client.get(
+                f"{GITHUB_API_BASE_URL}/user",
                 headers={"Authorization": f"Bearer {access_token}"},
             )
             user_response.raise_for_status()
@@ -183,20 +258,29 @@ class OAuthService:
 
             return user_data
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Network error getting user info: {e}")
             raise HTTPException(
                 status_code=500, detail="Failed to get user information from GitHub"
             ) from e
 
     @staticmethod
-    def process_oauth_callback(code: str, state: str, session_state: str) -> str:
+    async def process_oauth_callback(
+        client: httpx.AsyncClient, code: str, state: str, cookie_state: str
+    ) -> str:
         """Process OAuth callback and return session ID"""
-        if session_state != state:
+        # The state must match the one issued to this browser and still be
+        # unused in Redis
+        if cookie_state != state or not await OAuthService.consume_state(state):
             raise HTTPException(status_code=400, detail="Invalid state parameter")
 
-        access_token = OAuthService.exchange_code_for_token(code)
-        user_data = OAuthService.get_user_info(access_token)
+        # Claimed only once the state is valid, so a bad state can't burn
+        # the code
+        if not await OAuthService.mark_code_used(code):
+            raise HTTPException(status_code=400, detail="OAuth code already used")
+
+        access_token = await OAuthService.exchange_code_for_token(client, code)
+        user_data = await OAuthService.get_user_info(client, access_token)
 
         username = user_data.get("login")
         if not is_authorized_user(username):
@@ -207,68 +291,101 @@ class OAuthService:
                 ),
             )
 
-        session_id = SessionManager.create_session(user_data)
+        session_id = await SessionManager.create_session(user_data)
         return session_id
 
 
 # FastAPI Dependencies
-def get_current_user(session_id: str = Cookie(None, alias="user_session")) -> Dict:
+def get_github_client(request: Request) -> httpx.AsyncClient:
+    """FastAPI dependency returning the shared GitHub HTTP client"""
+    return request.app.state.github_client
+
+
+async def _resolve_user(
+    session_id: str = Cookie(None, alias="user_session"),
+) -> Optional[Dict]:
+    """Resolve the session cookie to user data.
+
+    Both auth dependencies below depend on this one, so FastAPI's per-request
+    dependency cache makes a single session lookup however they are combined.
+    """
+    if not session_id:
+        return None
+
+    # Extend session on each use
+    return await SessionManager.get_and_extend(session_id)
+
+
+async def get_current_user(
+    session_id: str = Cookie(None, alias="user_session"),
+    user_data: Optional[Dict] = Depends(_resolve_user),
+) -> Dict:
     """FastAPI dependency to get current authenticated user"""
     if not session_id:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    user_data = SessionManager.get_session(session_id)
     if not user_data:
         raise HTTPException(status_code=401, detail="Invalid or expired session")
 
-    # Extend session on each use
-    SessionManager.extend_session(session_id)
-
     return user_data
 
 
-def get_optional_user(
-    session_id: str = Cookie(None, alias="user_session"),
+async def get_optional_user(
+    user_data: Optional[Dict] = Depends(_resolve_user),
 ) -> Optional[Dict]:
     """FastAPI dependency to optionally get current authenticated user"""
-    if not session_id:
-        return None
-
-    user_data = SessionManager.get_session(session_id)
-    if user_data:
-        # Extend session on each use
-        SessionManager.extend_session(session_id)
-
     return user_data
 
 
-def require_auth(request: Request, user: Dict = Depends(get_current_user)) -> Dict:
+async def require_auth(
+    request: Request, user: Dict = Depends(get_current_user)
+) -> Dict:
     """FastAPI dependency that ensures user is authenticated"""
     # This dependency will automatically raise 401 if get_current_user fails
     return user
 
 
 # Utility Functions
-def create_login_url(request: Request) -> str:
-    """Create GitHub OAuth login URL with state parameter for CSRF protection"""
-    state = secrets.token_urlsafe(32)
+def create_github_client() -> httpx.AsyncClient:
+    """Create the HTTP client shared by all GitHub OAuth calls"""
+    # HTTP/2 and pooled keep-alive connections avoid a new TLS handshake
+    # with GitHub on every login
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=20),
+    )
+
+
+_random_buffer = threading.local()
+
+
+def _token_urlsafe(nbytes: int = 24) -> str:
+    """Return a URL-safe random token for session IDs and OAuth state.
 
-    # Store state in session temporarily (we'll use a simple in-memory cache for this)
-    # In production, you might want to store this in Redis with a short TTL
-    request.session["oauth_state"] = state
+    Random bytes are drawn from os.urandom in 4KB batches per thread instead
+    of one syscall per token. 24 bytes (192 bits) encode to 32 characters
+    with no base64 padding. Not meant for key material.
+    """
+    buf = getattr(_random_buffer, "buf", b"")
+    pos = getattr(_random_buffer, "pos", 0)
+    if len(buf) - pos < nbytes:
+        buf, pos = os.urandom(4096), 0
+        _random_buffer.buf = buf
+    _random_buffer.pos = pos + nbytes
+    token = buf[pos : pos + nbytes]
+    return base64.urlsafe_b64encode(token).rstrip(b"=").decode("ascii")
 
-    # Use explicit BASE_URL instead of request-based URL construction
-    # This ensures consistent redirect URIs regardless of proxy headers
-    redirect_uri = f"{BASE_URL.rstrip('/')}/auth/callback"
 
-    params = {
-        "client_id": GITHUB_CLIENT_ID,
-        "redirect_uri": redirect_uri,
-        "scope": "user:email",
-        "state": state,
-    }
+async def create_login_url() -> Tuple[str, str]:
+    """Create GitHub OAuth login URL with state parameter for CSRF protection"""
+    state = _token_urlsafe()
+
+    # Store state in Redis with a short TTL; the callback consumes it once
+    await OAuthService.store_state(state)
 
-    return f"https://github.com/login/oauth/authorize?{urlencode(params)}"
+    # The state is URL-safe base64, so it needs no quoting
+    return _LOGIN_URL_PREFIX + state, state
 
 
 def is_authorized_user(username: str) -> bool:
@@ -276,25 +393,40 @@ def is_authorized_user(username: str) -> bool:
     return username in ALLOWED_GITHUB_USERS
 
 
+# Cookie attributes shared by set and delete, built once at import
+_SESSION_COOKIE = {
+    "key": "user_session",
+    "path": "/",
+    "httponly": True,
+    "secure": SECURE_COOKIES,
+    "samesite": "lax",
+}
+_OAUTH_STATE_COOKIE = {**_SESSION_COOKIE, "key": "oauth_state", "path": "/auth"}
+
+
 def set_session_cookie(response: Response, session_id: str) -> None:
     """Set secure session cookie"""
     response.set_cookie(
-        key="user_session",
         value=session_id,
         max_age=SessionManager.SESSION_EXPIRE_TIME,
-        httponly=True,
-        secure=SECURE_COOKIES,
-        samesite="lax",
-        path="/",
+        **_SESSION_COOKIE,
     )
 
 
 def clear_session_cookie(response: Response) -> None:
     """Clear session cookie"""
-    response.delete_cookie(
-        key="user_session",
-        path="/",
-        httponly=True,
-        secure=SECURE_COOKIES,
-        samesite="lax",
+    response.delete_cookie(**_SESSION_COOKIE)
+
+
+def set_oauth_state_cookie(response: Response, state: str) -> None:
+    """Bind the OAuth state to the browser that started the login"""
+    response.set_cookie(
+        value=state,
+        max_age=OAuthService.STATE_EXPIRE_TIME,
+        **_OAUTH_STATE_COOKIE,
     )
+
+
+def clear_oauth_state_cookie(response: Response) -> None:
+    """Clear OAuth state cookie"""
+    response.delete_cookie(**_OAUTH_STATE_COOKIE)
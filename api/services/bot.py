@@ -1,76 +1,59 @@
 import logging
-import os
 from typing import Dict
 
-import redis
+import redis.asyncio as redis
 from fastapi import HTTPException
 
+from services.redis import redis_client
+
 logger = logging.getLogger(__name__)
 
 
 class BotService:
     def __init__(self):
-        self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
-        self.redis_client = self._init_redis_connection()
-
-    def _init_redis_connection(self) -> redis.Redis:
-        """Initialize Redis connection with error handling"""
-        try:
-            client = redis.from_url(self.redis_url, decode_responses=True)
-            client.ping()
-            logger.info(f"Bot service connected to Redis at {self.redis_url}")
-            return client
-        except redis.ConnectionError:
-            logger.error(f"Bot service failed to connect to Redis at {self.redis_url}")
-            return None
+        self.redis_client = redis_client
 
-    def _ensure_redis_connection(self):
-        """Ensure Redis connection is available"""
-        if not self.redis_client:
-            raise HTTPException(
-                status_code=500, detail="Redis connection not available"
-            )
-
-    def send_command(self, command: str) -> Dict[str, str]:
-        """Send a command to the bot via Redis"""
-        self._ensure_redis_connection()
+    @staticmethod
+    def _format_status(status: Dict[bytes, bytes]) -> Dict:
+        """Decode the bot status hash for API responses"""
+        if not status:
+            return {"running": False, "message": "No status available"}
+        return {k.decode(): v.decode() for k, v in status.items()}
 
+    async def send_command(self, command: str) -> Dict:
+        """Send a command to the bot and return the current status"""
         try:
-            self.redis_client.lpush("bot_commands", command)
-            logger.info(f"{command} command sent to bot")
-            return {"status": "command sent"}
+            # Push the command and read the status in one round trip
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.xadd("bot_commands", {"cmd": command}, maxlen=1000, approximate=True)
+            pipe.hgetall("bot_status")
+            _, status = await pipe.execute()
+            logger.info("%s command sent to bot", command)
+            return {"status": "command sent", "bot_status": self._format_status(status)}
         except redis.RedisError as e:
             logger.error(f"Redis error sending command {command}: {e}")
             raise HTTPException(
                 status_code=500, detail="Failed to send command to bot"
             ) from e
 
-    def start_bot(self) -> Dict[str, str]:
+    async def start_bot(self) -> Dict:
         """Start the bot"""
-        return self.send_command("START")
+        return await self.send_command("START")
 
-    def stop_bot(self) -> Dict[str, str]:
+    async def stop_bot(self) -> Dict:
         """Stop the bot"""
-        return self.send_command("STOP")
+        return await self.send_command("STOP")
 
-    def get_bot_status(self) -> Dict:
+    async def get_bot_status(self) -> Dict:
         """Get the current bot status"""
-        self._ensure_redis_connection()
-
         try:
-            status = self.redis_client.hgetall("bot_status")
-            if not status:
-                return {"running": False, "message": "No status available"}
-            return status
+            status = await self.redis_client.hgetall("bot_status")
+            return self._format_status(status)
         except redis.RedisError as e:
             logger.error(f"Redis error getting bot status: {e}")
             raise HTTPException(
                 status_code=500, detail="Failed to get bot status"
             ) from e
 
-    def get_health_status(self) -> str:
-        """Get Redis connection health status"""
-        return "connected" if self.redis_client else "disconnected"
-
 
 bot_service = BotService()
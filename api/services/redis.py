@@ -0,0 +1,43 @@
+import asyncio
+import logging
+import os
+
+import redis.asyncio as redis
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+# Single connection pool shared by every API module. Responses are left as
+# bytes; redis-py selects the hiredis parser automatically when installed.
+pool = redis.BlockingConnectionPool.from_url(REDIS_URL, max_connections=64)
+redis_client = redis.Redis(connection_pool=pool)
+
+
+async def wait_for_redis(max_retries: int = 5) -> None:
+    """Ping Redis with exponential backoff, raising if it never answers"""
+    retry_delay = 1
+    for attempt in range(max_retries):
+        try:
+            await redis_client.ping()
+            logger.info(f"API connected to Redis at {REDIS_URL}")
+            return
+        except redis.ConnectionError as e:
+            if attempt == max_retries - 1:
+                logger.error(
+                    f"Failed to connect to Redis after {max_retries} attempts: {e}"
+                )
+                raise
+            logger.warning(
+                f"Failed to connect to Redis "
+                f"(attempt {attempt + 1}/{max_retries}): {e}. "
+                f"Retrying in {retry_delay} seconds..."
+            )
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 30)
+
+
+def get_redis(request: Request) -> redis.Redis:
+    """FastAPI dependency returning the shared Redis client"""
+    return request.app.state.redis
@@ -59,6 +59,16 @@ async function logout() {
   }
 }
 
+// The bot writes its status up to ~100 ms after handling a command, so the
+// status returned with the command is from before it; show the command as
+// pending and re-fetch once the bot has had time to write the new status
+const STATUS_REFRESH_DELAY_MS = 250;
+
+function showCommandPending(message) {
+  renderStatus({ message });
+  setTimeout(updateStatus, STATUS_REFRESH_DELAY_MS);
+}
+
 async function startBot() {
   try {
     const response = await fetch("/api/bot/start", { method: "POST" });
@@ -67,8 +77,7 @@ async function startBot() {
       window.location.href = "/auth/login";
       return;
     }
-    const result = await response.json();
-    updateStatus();
+    showCommandPending("Start requested...");
   } catch (error) {
     console.error("Error starting bot:", error);
   }
@@ -82,8 +91,7 @@ async function stopBot() {
       window.location.href = "/auth/login";
       return;
     }
-    const result = await response.json();
-    updateStatus();
+    showCommandPending("Stop requested...");
   } catch (error) {
     console.error("Error stopping bot:", error);
   }
@@ -99,40 +107,44 @@ async function updateStatus() {
     }
     
     const status = await response.json();
-    
-    // Format the status for display
-    let statusHtml = '<div class="status-display">';
-    
-    if (status.message) {
-      statusHtml += `<div class="status-item"><strong>Status:</strong> ${status.message}</div>`;
-    } else {
-      statusHtml += `<div class="status-item"><strong>Running:</strong> ${status.running === 'True' ? 'Yes' : 'No'}</div>`;
-      statusHtml += `<div class="status-item"><strong>PnL:</strong> $${parseFloat(status.pnl || 0).toFixed(2)}</div>`;
-      statusHtml += `<div class="status-item"><strong>Positions:</strong> ${status.positions || 0}</div>`;
-      
-      // Convert UTC timestamp to local timezone
-      if (status.timestamp) {
-        const utcDate = new Date(status.timestamp);
-        const localTimestamp = utcDate.toLocaleString(undefined, {
-          year: 'numeric',
-          month: 'short',
-          day: 'numeric',
-          hour: '2-digit',
-          minute: '2-digit',
-          second: '2-digit',
-          timeZoneName: 'short'
-        });
-        statusHtml += `<div class="status-item"><strong>Last Updated:</strong> ${localTimestamp}</div>`;
-      }
-    }
-    
-    statusHtml += '</div>';
-    document.getElementById("status").innerHTML = statusHtml;
+    renderStatus(status);
   } catch (error) {
     console.error("Error updating status:", error);
   }
 }
 
+function renderStatus(status) {
+  // Format the status for display
+  let statusHtml = '<div class="status-display">';
+  
+  if (status.message) {
+    statusHtml += `<div class="status-item"><strong>Status:</strong> ${status.message}</div>`;
+  } else {
+    statusHtml += `<div class="status-item"><strong>Running:</strong> ${status.running === 'True' ? 'Yes' : 'No'}</div>`;
+    statusHtml += `<div class="status-item"><strong>PnL:</strong> $${parseFloat(status.pnl || 0).toFixed(2)}</div>`;
+    statusHtml += `<div class="status-item"><strong>Positions:</strong> ${status.positions || 0}</div>`;
+    
+    // Convert epoch nanoseconds to local timezone (drop digits below ms,
+    // which a JS Number can't hold exactly at this magnitude)
+    if (status.timestamp) {
+      const utcDate = new Date(Number(status.timestamp.slice(0, -6)));
+      const localTimestamp = utcDate.toLocaleString(undefined, {
+        year: 'numeric',
+        month: 'short',
+        day: 'numeric',
+        hour: '2-digit',
+        minute: '2-digit',
+        second: '2-digit',
+        timeZoneName: 'short'
+      });
+      statusHtml += `<div class="status-item"><strong>Last Updated:</strong> ${localTimestamp}</div>`;
+    }
+  }
+  
+  statusHtml += '</div>';
+  document.getElementById("status").innerHTML = statusHtml;
+}
+
 // Initialize app
 document.addEventListener("DOMContentLoaded", async function() {
   const isAuthenticated = await checkAuth();
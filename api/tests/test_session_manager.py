@@ -0,0 +1,60 @@
+import fakeredis
+import pytest
+from services import auth
+from services.auth import SessionManager
+
+GITHUB_USER = {
+    "id": 42,
+    "login": "octocat",
+    "avatar_url": "https://avatars.example/octocat.png",
+    "name": "The Octocat",
+    "email": None,
+}
+
+
+@pytest.fixture(autouse=True)
+def redis_conn(monkeypatch):
+    conn = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(auth, "redis_client", conn)
+    SessionManager._cache.clear()
+    yield conn
+    SessionManager._cache.clear()
+
+
+async def test_session_round_trips_through_a_redis_hash(redis_conn):
+    session_id = await SessionManager.create_session(GITHUB_USER)
+
+    key = f"session:{session_id}"
+    assert await redis_conn.type(key) == b"hash"
+    assert 0 < await redis_conn.ttl(key) <= SessionManager.SESSION_EXPIRE_TIME
+
+    # Hash values come back as strings; missing profile fields are omitted
+    expected = {
+        "user_id": "42",
+        "username": "octocat",
+        "avatar_url": "https://avatars.example/octocat.png",
+        "name": "The Octocat",
+    }
+    assert await SessionManager.get_session(session_id) == expected
+    assert await SessionManager.get_and_extend(session_id) == expected
+
+
+async def test_get_and_extend_refreshes_expiry_and_returns_copies(redis_conn):
+    session_id = await SessionManager.create_session(GITHUB_USER)
+    key = f"session:{session_id}"
+    await redis_conn.expire(key, 60)
+
+    user = await SessionManager.get_and_extend(session_id)
+    assert await redis_conn.ttl(key) > 60
+
+    user["username"] = "mallory"
+    assert (await SessionManager.get_and_extend(session_id))["username"] == "octocat"
+
+
+async def test_deleted_session_is_gone(redis_conn):
+    session_id = await SessionManager.create_session(GITHUB_USER)
+    await SessionManager.get_and_extend(session_id)
+
+    assert await SessionManager.delete_session(session_id)
+    assert await SessionManager.get_and_extend(session_id) is None
+    assert await redis_conn.exists(f"session:{session_id}") == 0
@@ -1,17 +1,36 @@
 import logging
-from datetime import datetime, timezone
+from time import time_ns
 from typing import Any, Dict
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
 class TradingBot:
     """Pure trading bot business logic, free from infrastructure concerns"""
 
+    POSITION_CAPACITY = 1024  # initial number of symbol slots
+
     def __init__(self):
         self.running = False
-        self.positions = {}
+        # Positions are stored column-wise: one slot per symbol across
+        # parallel arrays, so mark-to-market PnL is a single vector operation
+        self._sym_idx: Dict[str, int] = {}
+        self._qty = np.zeros(self.POSITION_CAPACITY, dtype=np.float64)
+        self._avg = np.zeros(self.POSITION_CAPACITY, dtype=np.float64)
+        self._mark = np.zeros(self.POSITION_CAPACITY, dtype=np.float64)
+        self._n = 0
         self.pnl = 0.0
+        # Reused by get_status so each tick doesn't build a new dict. Keys and
+        # values are bytes, which redis-py sends without re-encoding
+        self._status = {
+            b"running": b"False",
+            b"pnl": b"0.000000",
+            b"positions": b"0",
+            b"timestamp": b"0",
+        }
+        self._status_positions = 0
 
     def start_trading(self):
         """Start the trading bot"""
@@ -30,6 +49,49 @@ class TradingBot:
         """Update PnL with a change amount"""
         self.pnl += change
 
+    def _slot(self, symbol: str) -> int:
+        """Return the array slot for a symbol, allocating one if needed"""
+        idx = self._sym_idx.get(symbol)
+        if idx is None:
+            idx = self._n
+            if idx == len(self._qty):
+                self._grow()
+            self._sym_idx[symbol] = idx
+            self._n += 1
+        return idx
+
+    def _grow(self):
+        """Double the capacity of the position arrays"""
+        capacity = 2 * len(self._qty)
+        for name in ("_qty", "_avg", "_mark"):
+            grown = np.zeros(capacity, dtype=np.float64)
+            grown[: self._n] = getattr(self, name)[: self._n]
+            setattr(self, name, grown)
+
+    def add_fill(self, symbol: str, qty: float, price: float):
+        """Apply a fill (positive qty buys, negative sells) to a position"""
+        idx = self._slot(symbol)
+        old_qty = self._qty[idx]
+        new_qty = old_qty + qty
+
+        if new_qty == 0:
+            self._avg[idx] = 0.0
+        elif old_qty == 0 or (old_qty > 0) == (qty > 0):
+            # Adding to the position moves the average entry price
+            self._avg[idx] = (old_qty * self._avg[idx] + qty * price) / new_qty
+        elif (new_qty > 0) != (old_qty > 0):
+            # The position flipped sides, so the remainder opened at price
+            self._avg[idx] = price
+
+        self._qty[idx] = new_qty
+        self._mark[idx] = price
+
+    @property
+    def pnl_mtm(self) -> float:
+        """Unrealized PnL of all positions at their last marked price"""
+        n = self._n
+        return float(np.dot(self._qty[:n], self._mark[:n] - self._avg[:n]))
+
     def process_market_data(self, data: str):
         """Process market data and make trading decisions"""
         pass
@@ -38,11 +100,18 @@ class TradingBot:
         """Execute trades via broker API"""
         logger.info(f"Executing trade: {trade_data}")
 
-    def get_status(self) -> Dict[str, str]:
-        """Get current bot status as a string dictionary for Redis storage"""
-        return {
-            "running": str(self.running),
-            "pnl": str(self.pnl),
-            "positions": str(len(self.positions)),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
+    def get_status(self) -> Dict[bytes, bytes]:
+        """Get current bot status as a bytes dictionary for Redis storage.
+
+        The same dictionary is updated in place and returned on every call.
+        """
+        status = self._status
+        status[b"running"] = b"True" if self.running else b"False"
+        status[b"pnl"] = b"%.6f" % self.pnl
+        # Closed positions keep their slot, so count only non-zero quantities
+        positions = int(np.count_nonzero(self._qty[: self._n]))
+        if positions != self._status_positions:
+            self._status_positions = positions
+            status[b"positions"] = b"%d" % positions
+        status[b"timestamp"] = b"%d" % time_ns()  # epoch nanoseconds
+        return status
@@ -10,106 +10,167 @@ logger = logging.getLogger(__name__)
 
 
 class CommandHandler:
+    COMMAND_STREAM = "bot_commands"
+    CONSUMER_GROUP = "bot"
+    CONSUMER_NAME = "bot-1"
+    STATUS_FLUSH_INTERVAL = 0.1  # seconds between coalesced status writes
+
     def __init__(self, redis_manager: RedisManager, shutdown_manager: ShutdownManager):
         self.redis_manager = redis_manager
         self.shutdown_manager = shutdown_manager
         self._market_data_task: Optional[asyncio.Task] = None
+        self._group_ready = False
+        self._status_bot = None
+        self._status_redis: Optional[redis.Redis] = None
+        self._status_dirty = asyncio.Event()
+        self._status_flush_task: Optional[asyncio.Task] = None
+        self._dispatch = {"START": self._on_start, "STOP": self._on_stop}
+
+    async def _ensure_consumer_group(self, redis_conn: redis.Redis):
+        """Create the command stream and consumer group if they don't exist"""
+        if self._group_ready:
+            return
+
+        try:
+            # Start from the beginning of the stream so commands sent before
+            # the group existed are still delivered; XADD caps its length
+            await redis_conn.xgroup_create(
+                self.COMMAND_STREAM, self.CONSUMER_GROUP, id="0", mkstream=True
+            )
+            logger.info(f"Created consumer group {self.CONSUMER_GROUP}")
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
 
     async def process_commands(self, bot):
         """Process commands from the API via Redis"""
+        # The shared shutdown future is raced against every read instead of
+        # creating and cancelling a new waiter per command
+        shutdown_future = self.shutdown_manager.shutdown_future
+        self._status_flush_task = asyncio.create_task(self._status_flusher())
+        self.shutdown_manager.register_task(self._status_flush_task)
+        redis_conn = None
+        # Entries delivered to this consumer but never acked (e.g. the process
+        # died mid-batch) stay pending; "0" rereads them before new ones (">")
+        read_id = "0"
         while not self.shutdown_manager.is_shutdown_requested:
-            redis_conn = await self.redis_manager.get_connection()
-
+            # Only re-check the connection after a failure, not before
+            # every read
             if not redis_conn:
-                try:
-                    await asyncio.wait_for(
-                        self.shutdown_manager.wait_for_shutdown(), timeout=1.0
-                    )
-                    break
-                except asyncio.TimeoutError:
+                redis_conn = await self.redis_manager.get_command_connection()
+                if not redis_conn:
+                    await self.shutdown_manager.sleep(1.0)
                     continue
 
             try:
+                await self._ensure_consumer_group(redis_conn)
+
                 redis_task = asyncio.create_task(
-                    redis_conn.brpop("bot_commands", timeout=0)
+                    redis_conn.xreadgroup(
+                        self.CONSUMER_GROUP,
+                        self.CONSUMER_NAME,
+                        {self.COMMAND_STREAM: read_id},
+                        count=16,
+                        block=0 if read_id == ">" else None,
+                    )
                 )
                 self.shutdown_manager.register_task(redis_task)
 
-                shutdown_task = asyncio.create_task(
-                    self.shutdown_manager.wait_for_shutdown()
+                await asyncio.wait(
+                    {redis_task, shutdown_future},
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
 
-                done, pending = await asyncio.wait(
-                    [redis_task, shutdown_task], return_when=asyncio.FIRST_COMPLETED
-                )
-
-                for task in pending:
-                    task.cancel()
+                if shutdown_future.done() and not redis_task.done():
+                    redis_task.cancel()
                     try:
-                        await task
+                        await redis_task
                     except asyncio.CancelledError:
                         pass
-
-                if shutdown_task in done:
                     logger.info("Command processing cancelled due to shutdown")
                     break
 
-                if redis_task in done:
-                    command = await redis_task
-                    if command:
-                        cmd = (
-                            command[1]
-                            if isinstance(command[1], str)
-                            else command[1].decode()
-                        )
-                        logger.info(f"Received command: {cmd}")
-                        await self._handle_command(cmd, bot)
+                # A read that finished alongside shutdown is still handled;
+                # the loop exits afterwards
+                results = redis_task.result()
+                if read_id == "0" and not any(entries for _, entries in results):
+                    read_id = ">"
+                for _, entries in results:
+                    await self._handle_entries(redis_conn, entries, bot)
 
             except redis.RedisError as e:
                 logger.error(f"Redis command error: {e}")
-                try:
-                    await asyncio.wait_for(
-                        self.shutdown_manager.wait_for_shutdown(), timeout=5.0
-                    )
-                    break
-                except asyncio.TimeoutError:
-                    continue
+                redis_conn = None
+                # The group is gone if Redis restarted without persistence
+                self._group_ready = False
+                read_id = "0"
+                await self.shutdown_manager.sleep(5.0)
             except Exception as e:
                 logger.error(f"Unexpected command error: {e}")
-                try:
-                    await asyncio.wait_for(
-                        self.shutdown_manager.wait_for_shutdown(), timeout=1.0
-                    )
-                    break
-                except asyncio.TimeoutError:
-                    continue
+                read_id = "0"
+                await self.shutdown_manager.sleep(1.0)
 
         await self._cleanup_market_task()
+        await self._stop_status_flusher()
 
-    async def _handle_command(self, cmd: str, bot):
-        """Handle individual commands"""
-        if cmd == "START":
-            if not bot.is_running:
-                bot.start_trading()
-                logger.info("Bot started")
-
-            if not self._market_data_task or self._market_data_task.done():
-                from handlers.market_handler import MarketHandler
-
-                market_handler = MarketHandler(
-                    self.shutdown_manager, update_status_callback=self._update_status
-                )
-                self._market_data_task = asyncio.create_task(
-                    market_handler.handle_market_data(bot)
+    async def _handle_entries(self, redis_conn: redis.Redis, entries, bot):
+        """Handle a batch of stream entries and acknowledge the handled ones"""
+        handled = []
+        try:
+            for entry_id, fields in entries:
+                # Pending entries trimmed from the stream come back without
+                # fields; there is nothing left to run, so just ack them
+                if fields:
+                    cmd = fields.get(b"cmd", b"").decode()
+                    logger.info(f"Received command: {cmd}")
+                    try:
+                        await self._handle_command(cmd, bot)
+                    except Exception as e:
+                        # Acked anyway so one bad command can't block the rest
+                        logger.error(f"Command {cmd} failed: {e}")
+                handled.append(entry_id)
+        finally:
+            if handled:
+                await redis_conn.xack(
+                    self.COMMAND_STREAM, self.CONSUMER_GROUP, *handled
                 )
-                self.shutdown_manager.register_task(self._market_data_task)
 
+    async def _handle_command(self, cmd: str, bot):
+        """Handle individual commands"""
+        handler = self._dispatch.get(cmd)
+        if handler:
+            await handler(bot)
+
+    async def _on_start(self, bot):
+        """Start trading and the market data handler"""
+        # A duplicate START leaves the status unchanged, so it isn't rewritten
+        started = not bot.is_running
+        if started:
+            bot.start_trading()
+            logger.info("Bot started")
+
+        if not self._market_data_task or self._market_data_task.done():
+            from handlers.market_handler import MarketHandler
+
+            market_handler = MarketHandler(
+                self.shutdown_manager, update_status_callback=self._update_status
+            )
+            self._market_data_task = asyncio.create_task(
+                market_handler.handle_market_data(bot)
+            )
+            self.shutdown_manager.register_task(self._market_data_task)
+
+        if started:
             await self._update_status(bot)
 
-        elif cmd == "STOP":
-            logger.info("Bot stopping...")
-            bot.stop_trading()
-            await self._cleanup_market_task()
+    async def _on_stop(self, bot):
+        """Stop trading and the market data handler"""
+        stopped = bot.is_running
+        logger.info("Bot stopping...")
+        bot.stop_trading()
+        await self._cleanup_market_task()
+        if stopped:
             await self._update_status(bot)
 
     async def _cleanup_market_task(self):
@@ -124,14 +185,56 @@ class CommandHandler:
             self._market_data_task = None
 
     async def _update_status(self, bot):
-        """Update bot status in Redis"""
-        redis_conn = await self.redis_manager.get_connection()
-        if not redis_conn:
-            return
+        """Mark the bot status dirty for the status flusher"""
+        # The status is built at flush time, once per interval, not per tick
+        self._status_bot = bot
+        self._status_dirty.set()
+
+    async def _status_flusher(self):
+        """Coalesce queued status updates into one Redis write per interval"""
+        while True:
+            await self._status_dirty.wait()
+            await asyncio.sleep(self.STATUS_FLUSH_INTERVAL)
+            await self._flush_status()
+
+    async def _stop_status_flusher(self):
+        """Stop the status flusher, writing any update still queued"""
+        if self._status_flush_task and not self._status_flush_task.done():
+            self._status_flush_task.cancel()
+            try:
+                await self._status_flush_task
+            except asyncio.CancelledError:
+                pass
+        self._status_flush_task = None
+
+        if self._status_dirty.is_set():
+            await self._flush_status()
 
+    async def _flush_status(self):
+        """Write the latest queued status to Redis"""
+        # Cleared before the status is built, so updates queued during the
+        # write are kept for the next flush
+        self._status_dirty.clear()
         try:
-            status = bot.get_status()
-            await redis_conn.hset("bot_status", mapping=status)
-            logger.debug(f"Status updated: {status}")
+            # Only re-fetch (and ping) the client after a failure, not before
+            # every write
+            if not self._status_redis:
+                self._status_redis = await self.redis_manager.get_connection()
+                if not self._status_redis:
+                    # Nothing may queue another update (e.g. after STOP), so
+                    # keep this one for the next flush
+                    self._status_dirty.set()
+                    return
+
+            status = self._status_bot.get_status()
+            await self._status_redis.hset("bot_status", mapping=status)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Status updated: %s", status)
+        except asyncio.CancelledError:
+            # Keep the update queued so _stop_status_flusher still writes it
+            self._status_dirty.set()
+            raise
         except redis.RedisError as e:
             logger.error(f"Failed to update status: {e}")
+            self._status_redis = None
+            self._status_dirty.set()
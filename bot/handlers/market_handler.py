@@ -1,16 +1,21 @@
 import asyncio
 import logging
-import random
 
+import numpy as np
 from infrastructure.shutdown_manager import ShutdownManager
 
 logger = logging.getLogger(__name__)
 
 
 class MarketHandler:
+    PNL_BATCH_SIZE = 1024  # simulated PnL changes drawn per RNG call
+
     def __init__(self, shutdown_manager: ShutdownManager, update_status_callback=None):
         self.shutdown_manager = shutdown_manager
         self.update_status_callback = update_status_callback
+        self._rng = np.random.default_rng()
+        self._pnl_changes = self._draw_pnl_changes()
+        self._pnl_index = 0
 
     async def handle_market_data(self, bot):
         """Handle incoming market data"""
@@ -18,13 +23,8 @@ class MarketHandler:
 
         try:
             while bot.is_running and not self.shutdown_manager.is_shutdown_requested:
-                try:
-                    await asyncio.wait_for(
-                        self.shutdown_manager.wait_for_shutdown(), timeout=1.0
-                    )
+                if await self.shutdown_manager.sleep(1.0):
                     break
-                except asyncio.TimeoutError:
-                    pass
 
                 if bot.is_running and not self.shutdown_manager.is_shutdown_requested:
                     await self._simulate_trading_activity(bot)
@@ -33,18 +33,21 @@ class MarketHandler:
             logger.info("Market data handler cancelled")
         except Exception as e:
             logger.error(f"Market data error: {e}")
-            try:
-                await asyncio.wait_for(
-                    self.shutdown_manager.wait_for_shutdown(), timeout=5.0
-                )
-            except asyncio.TimeoutError:
-                pass
+            await self.shutdown_manager.sleep(5.0)
 
         logger.info("Market data handler stopped")
 
+    def _draw_pnl_changes(self) -> list:
+        """Draw a batch of simulated PnL changes as plain Python floats"""
+        return self._rng.uniform(-10, 10, self.PNL_BATCH_SIZE).tolist()
+
     async def _simulate_trading_activity(self, bot):
         """Simulate some trading activity for demo purposes"""
-        bot.update_pnl(random.uniform(-10, 10))
+        if self._pnl_index == self.PNL_BATCH_SIZE:
+            self._pnl_changes = self._draw_pnl_changes()
+            self._pnl_index = 0
+        bot.update_pnl(self._pnl_changes[self._pnl_index])
+        self._pnl_index += 1
 
         # Update status after PnL change
         if self.update_status_callback:
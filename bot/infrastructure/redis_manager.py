@@ -5,17 +5,24 @@ from typing import Optional
 
 import redis.asyncio as redis
 
+from infrastructure.shutdown_manager import ShutdownManager
+
 logger = logging.getLogger(__name__)
 
 
 class RedisManager:
+    MAX_CONNECTIONS = 4
+    HEALTH_CHECK_INTERVAL = 30  # seconds
+
     def __init__(self, redis_url: Optional[str] = None):
         self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
         self.redis: Optional[redis.Redis] = None
+        self._pool: Optional[redis.ConnectionPool] = None
+        self._command_redis: Optional[redis.Redis] = None
         self._connection_lock = asyncio.Lock()
 
     async def connect(
-        self, max_retries: int = 5, shutdown_event: Optional[asyncio.Event] = None
+        self, max_retries: int = 5, shutdown_manager: Optional[ShutdownManager] = None
     ):
         """Initialize async Redis connection with retry logic"""
         async with self._connection_lock:
@@ -24,14 +31,22 @@ class RedisManager:
 
             retry_delay = 1
             for attempt in range(max_retries):
-                if shutdown_event and shutdown_event.is_set():
+                if shutdown_manager and shutdown_manager.is_shutdown_requested:
                     logger.info(
                         "Shutdown requested, stopping Redis connection attempts"
                     )
                     return
 
                 try:
-                    self.redis = redis.from_url(self.redis_url, decode_responses=True)
+                    # One pool for the process, reused across reconnects.
+                    # Replies stay as bytes; callers decode only what they use
+                    if self._pool is None:
+                        self._pool = redis.ConnectionPool.from_url(
+                            self.redis_url,
+                            max_connections=self.MAX_CONNECTIONS,
+                            health_check_interval=self.HEALTH_CHECK_INTERVAL,
+                        )
+                    self.redis = redis.Redis(connection_pool=self._pool)
                     await self.redis.ping()
                     logger.info(f"Connected to Redis at {self.redis_url}")
                     return
@@ -43,16 +58,11 @@ class RedisManager:
                             f"(attempt {attempt + 1}/{max_retries}): {e}. "
                             f"Retrying in {retry_delay} seconds..."
                         )
-                        try:
-                            if shutdown_event:
-                                await asyncio.wait_for(
-                                    shutdown_event.wait(), timeout=retry_delay
-                                )
+                        if shutdown_manager:
+                            if await shutdown_manager.sleep(retry_delay):
                                 return
-                            else:
-                                await asyncio.sleep(retry_delay)
-                        except asyncio.TimeoutError:
-                            pass
+                        else:
+                            await asyncio.sleep(retry_delay)
                         retry_delay = min(retry_delay * 2, 30)
                         continue
                     else:
@@ -61,10 +71,12 @@ class RedisManager:
                             f"attempts: {e}"
                         )
 
-    async def ensure_connection(self, shutdown_event: Optional[asyncio.Event] = None):
+    async def ensure_connection(
+        self, shutdown_manager: Optional[ShutdownManager] = None
+    ):
         """Ensure Redis connection is available, reconnect if needed"""
         if not self.redis:
-            await self.connect(shutdown_event=shutdown_event)
+            await self.connect(shutdown_manager=shutdown_manager)
 
         if self.redis:
             try:
@@ -72,18 +84,37 @@ class RedisManager:
             except redis.ConnectionError:
                 logger.warning("Redis connection lost, attempting to reconnect...")
                 self.redis = None
-                await self.connect(shutdown_event=shutdown_event)
+                await self.connect(shutdown_manager=shutdown_manager)
 
     async def get_connection(self) -> Optional[redis.Redis]:
         """Get the Redis connection, ensuring it's healthy"""
         await self.ensure_connection()
         return self.redis
 
+    async def get_command_connection(self) -> Optional[redis.Redis]:
+        """Get the dedicated client for blocking command reads.
+
+        It holds one pooled connection for good, so a blocked read never
+        competes with status writes for a connection.
+        """
+        await self.ensure_connection()
+        if self.redis and not self._command_redis:
+            self._command_redis = redis.Redis(
+                connection_pool=self._pool, single_connection_client=True
+            )
+        return self._command_redis
+
     async def close(self):
         """Close the Redis connection"""
+        if self._command_redis:
+            await self._command_redis.aclose()
+            self._command_redis = None
         if self.redis:
             await self.redis.aclose()
             self.redis = None
+        if self._pool:
+            await self._pool.disconnect()
+            self._pool = None
             logger.info("Redis connection closed")
 
     @property
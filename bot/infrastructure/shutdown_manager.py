@@ -1,38 +1,41 @@
 import asyncio
 import logging
 import signal
-from typing import List, Optional, Set
+import weakref
+from functools import partial
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
 
 class ShutdownManager:
     def __init__(self):
-        self.shutdown_event = asyncio.Event()
-        self._tasks: Set[asyncio.Task] = set()
+        # Weak references let finished tasks drop out without done callbacks
+        self._tasks: weakref.WeakSet[asyncio.Task] = weakref.WeakSet()
         self._shutdown_callbacks: List[callable] = []
+        self._shutdown_future: Optional[asyncio.Future] = None
 
     async def setup_signal_handlers(self):
         """Set up asyncio signal handlers for graceful shutdown"""
         loop = asyncio.get_running_loop()
 
         for sig in [signal.SIGTERM, signal.SIGINT]:
-            loop.add_signal_handler(sig, lambda s=sig: self._handle_signal(s))
+            loop.add_signal_handler(sig, partial(self._handle_signal, sig))
 
         if hasattr(signal, "SIGHUP"):
             loop.add_signal_handler(
-                signal.SIGHUP, lambda: self._handle_signal(signal.SIGHUP)
+                signal.SIGHUP, partial(self._handle_signal, signal.SIGHUP)
             )
 
     def _handle_signal(self, signum: int) -> None:
         """Handle shutdown signals"""
         logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-        self.shutdown_event.set()
+        if not self.shutdown_future.done():
+            self.shutdown_future.set_result(None)
 
     def register_task(self, task: asyncio.Task) -> None:
         """Register a task for cleanup during shutdown"""
         self._tasks.add(task)
-        task.add_done_callback(self._tasks.discard)
 
     def add_shutdown_callback(self, callback: callable) -> None:
         """Add a callback to run during shutdown"""
@@ -40,21 +43,20 @@ class ShutdownManager:
 
     async def wait_for_shutdown(self) -> None:
         """Wait for shutdown signal"""
-        await self.shutdown_event.wait()
+        await asyncio.shield(self.shutdown_future)
 
     async def cancel_tasks(self) -> None:
         """Cancel all registered tasks"""
-        if not self._tasks:
+        tasks = [task for task in self._tasks if not task.done()]
+        if not tasks:
             return
 
-        logger.info(f"Cancelling {len(self._tasks)} tasks...")
+        logger.info(f"Cancelling {len(tasks)} tasks...")
 
-        for task in self._tasks.copy():
-            if not task.done():
-                task.cancel()
+        for task in tasks:
+            task.cancel()
 
-        if self._tasks:
-            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     async def run_shutdown_callbacks(self) -> None:
         """Run all shutdown callbacks"""
@@ -75,47 +77,25 @@ class ShutdownManager:
         logger.info("Shutdown complete")
 
     @property
-    def is_shutdown_requested(self) -> bool:
-        """Check if shutdown has been requested"""
-        return self.shutdown_event.is_set()
-
-    async def wait_with_shutdown(self, coro_or_future, timeout: Optional[float] = None):
-        """Wait for a coroutine/future or shutdown, whichever comes first"""
-        shutdown_task = asyncio.create_task(self.shutdown_event.wait())
-
-        if asyncio.iscoroutine(coro_or_future):
-            main_task = asyncio.create_task(coro_or_future)
-        elif asyncio.isfuture(coro_or_future) or hasattr(coro_or_future, "__await__"):
-            main_task = coro_or_future
-        else:
-            raise TypeError(f"Expected coroutine or future, got {type(coro_or_future)}")
-
-        try:
-            done, pending = await asyncio.wait(
-                [main_task, shutdown_task],
-                timeout=timeout,
-                return_when=asyncio.FIRST_COMPLETED,
-            )
-
-            for task in pending:
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
+    def shutdown_future(self) -> asyncio.Future:
+        """Future that is resolved once shutdown is requested.
 
-            if shutdown_task in done:
-                if not main_task.done():
-                    main_task.cancel()
-                raise asyncio.CancelledError("Shutdown requested")
+        Shared by every caller that races work against shutdown, so none of
+        them needs its own waiter. Never cancel it; shield it when awaiting.
+        """
+        if self._shutdown_future is None:
+            self._shutdown_future = asyncio.get_running_loop().create_future()
+        return self._shutdown_future
 
-            if main_task in done:
-                return await main_task
+    async def sleep(self, delay: float) -> bool:
+        """Sleep for delay seconds, waking early on shutdown.
 
-            raise asyncio.TimeoutError()
+        Returns True if shutdown was requested.
+        """
+        await asyncio.wait({self.shutdown_future}, timeout=delay)
+        return self.shutdown_future.done()
 
-        except Exception:
-            for task in [main_task, shutdown_task]:
-                if not task.done():
-                    task.cancel()
-            raise
+    @property
+    def is_shutdown_requested(self) -> bool:
+        """Check if shutdown has been requested"""
+        return self._shutdown_future is not None and self._shutdown_future.done()
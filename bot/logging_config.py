@@ -1,6 +1,60 @@
+import atexit
+import io
 import logging
 import os
 import sys
+import threading
+from typing import Optional
+
+STDOUT_BUFFER_SIZE = 64 * 1024
+STDOUT_FLUSH_INTERVAL = 1.0  # max seconds a record waits in the buffer
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that leaves flushing to its stream's buffer.
+
+    A background timer flushes records at most flush_interval seconds after
+    they are written. The buffer is also flushed whenever a WARNING or higher
+    record is logged, so buffered output is written before the warning shows
+    up on stderr.
+    """
+
+    def __init__(self, stream=None, flush_interval: float = STDOUT_FLUSH_INTERVAL):
+        super().__init__(stream)
+        self.flush_interval = flush_interval
+        self._flush_timer: Optional[threading.Timer] = None
+
+    def handle(self, record):
+        if record.levelno >= logging.WARNING:
+            self.flush()
+        return super().handle(record)
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            # One timer per interval, however many records are written
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        with self.lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            super().flush()
+
+
+class _BelowWarningFilter(logging.Filter):
+    """Pass only records below WARNING"""
+
+    def filter(self, record):
+        return record.levelno < logging.WARNING
 
 
 def setup_logging():
@@ -16,16 +70,23 @@ def setup_logging():
     # Clear existing handlers
     root_logger.handlers.clear()
 
-    # Create formatter
+    # Create formatter; the raw epoch time avoids a strftime per record
     formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        "%(created).3f - %(name)s - %(levelname)s - %(message)s"
     )
 
-    # Handler for INFO and DEBUG (stdout)
-    stdout_handler = logging.StreamHandler(sys.stdout)
+    # Handler for INFO and DEBUG (stdout), written in 64KB blocks instead of
+    # one write per record
+    stdout_stream = io.TextIOWrapper(
+        io.BufferedWriter(sys.stdout.buffer, buffer_size=STDOUT_BUFFER_SIZE),
+        encoding=sys.stdout.encoding,
+        errors=sys.stdout.errors,
+    )
+    atexit.register(stdout_stream.flush)
+    stdout_handler = _BufferedStreamHandler(stdout_stream)
     stdout_handler.setLevel(log_level)
     stdout_handler.setFormatter(formatter)
-    stdout_handler.addFilter(lambda record: record.levelno < logging.WARNING)
+    stdout_handler.addFilter(_BelowWarningFilter())
 
     # Handler for WARNING and ERROR (stderr)
     stderr_handler = logging.StreamHandler(sys.stderr)
@@ -7,6 +7,11 @@ from infrastructure.redis_manager import RedisManager
 from infrastructure.shutdown_manager import ShutdownManager
 from logging_config import setup_logging
 
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
+
 setup_logging()
 logger = logging.getLogger(__name__)
 
@@ -28,9 +33,7 @@ class BotOrchestrator:
 
         self.shutdown_manager.add_shutdown_callback(self.redis_manager.close)
 
-        await self.redis_manager.connect(
-            shutdown_event=self.shutdown_manager.shutdown_event
-        )
+        await self.redis_manager.connect(shutdown_manager=self.shutdown_manager)
 
         await self._update_initial_status()
 
@@ -63,4 +66,6 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    loop_factory = uvloop.new_event_loop if uvloop else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main())
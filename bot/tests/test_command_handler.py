@@ -0,0 +1,170 @@
+import asyncio
+
+import fakeredis
+import pytest
+from core.trading_bot import TradingBot
+from handlers.command_handler import CommandHandler
+from infrastructure.shutdown_manager import ShutdownManager
+
+STREAM = CommandHandler.COMMAND_STREAM
+GROUP = CommandHandler.CONSUMER_GROUP
+CONSUMER = CommandHandler.CONSUMER_NAME
+
+
+class FakeRedisManager:
+    """Hands out one fake Redis client and counts connection lookups"""
+
+    def __init__(self, redis_conn):
+        self.redis_conn = redis_conn
+        self.connection_calls = 0
+
+    async def get_connection(self):
+        self.connection_calls += 1
+        return self.redis_conn
+
+    async def get_command_connection(self):
+        return self.redis_conn
+
+
+@pytest.fixture
+def redis_conn():
+    return fakeredis.FakeAsyncRedis()
+
+
+@pytest.fixture
+def handler(redis_conn):
+    return CommandHandler(FakeRedisManager(redis_conn), ShutdownManager())
+
+
+async def _pending_count(redis_conn):
+    return (await redis_conn.xpending(STREAM, GROUP))["pending"]
+
+
+async def test_handle_entries_acks_failed_commands_and_the_rest_of_the_batch(
+    handler, redis_conn
+):
+    await redis_conn.xgroup_create(STREAM, GROUP, id="0", mkstream=True)
+    await redis_conn.xadd(STREAM, {"cmd": "START"})
+    await redis_conn.xadd(STREAM, {"cmd": "STOP"})
+    [[_, entries]] = await redis_conn.xreadgroup(GROUP, CONSUMER, {STREAM: ">"})
+
+    seen = []
+
+    async def handle_command(cmd, bot):
+        seen.append(cmd)
+        if cmd == "START":
+            raise RuntimeError("boom")
+
+    handler._handle_command = handle_command
+    await handler._handle_entries(redis_conn, entries, TradingBot())
+
+    assert seen == ["START", "STOP"]
+    assert await _pending_count(redis_conn) == 0
+
+
+async def test_process_commands_replays_pending_entries_before_new_ones(
+    handler, redis_conn
+):
+    await redis_conn.xadd(STREAM, {"cmd": "STOP"})  # sent before the group existed
+    await redis_conn.xgroup_create(STREAM, GROUP, id="0", mkstream=True)
+    await redis_conn.xadd(STREAM, {"cmd": "START"})
+    # Delivered to this consumer by a previous process that died before XACK
+    await redis_conn.xreadgroup(GROUP, CONSUMER, {STREAM: ">"}, count=1)
+    await redis_conn.xadd(STREAM, {"cmd": "STOP"})
+
+    seen = []
+
+    async def handle_command(cmd, bot):
+        seen.append(cmd)
+
+    handler._handle_command = handle_command
+    task = asyncio.create_task(handler.process_commands(TradingBot()))
+    try:
+        for _ in range(100):
+            if len(seen) == 3:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        handler.shutdown_manager._handle_signal(15)
+        await asyncio.wait_for(task, timeout=5)
+
+    assert seen == ["STOP", "START", "STOP"]
+    assert await _pending_count(redis_conn) == 0
+
+
+async def test_process_commands_delivers_commands_sent_before_the_group(
+    handler, redis_conn
+):
+    await redis_conn.xadd(STREAM, {"cmd": "START"})
+
+    seen = []
+
+    async def handle_command(cmd, bot):
+        seen.append(cmd)
+
+    handler._handle_command = handle_command
+    task = asyncio.create_task(handler.process_commands(TradingBot()))
+    try:
+        for _ in range(100):
+            if seen:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        handler.shutdown_manager._handle_signal(15)
+        await asyncio.wait_for(task, timeout=5)
+
+    assert seen == ["START"]
+
+
+async def test_status_flusher_writes_once_per_interval_on_one_connection(
+    handler, redis_conn
+):
+    bot = TradingBot()
+    handler._status_flush_task = asyncio.create_task(handler._status_flusher())
+    for _ in range(3):
+        bot.update_pnl(1.0)
+        await handler._update_status(bot)
+        await asyncio.sleep(CommandHandler.STATUS_FLUSH_INTERVAL * 1.5)
+    await handler._stop_status_flusher()
+
+    assert await redis_conn.hget("bot_status", "pnl") == b"3.000000"
+    assert handler.redis_manager.connection_calls == 1
+
+
+async def test_stop_status_flusher_writes_a_status_cancelled_mid_write(
+    handler, redis_conn
+):
+    hset = redis_conn.hset
+    stalled = asyncio.Event()
+
+    async def stall_first_hset(*args, **kwargs):
+        if not stalled.is_set():
+            stalled.set()
+            await asyncio.sleep(10)
+        return await hset(*args, **kwargs)
+
+    redis_conn.hset = stall_first_hset
+    bot = TradingBot()
+    bot.start_trading()
+    handler._status_flush_task = asyncio.create_task(handler._status_flusher())
+    await handler._update_status(bot)
+    await asyncio.wait_for(stalled.wait(), timeout=5)
+
+    await handler._stop_status_flusher()
+
+    assert await redis_conn.hget("bot_status", "running") == b"True"
+
+
+async def test_flush_status_keeps_the_update_queued_without_a_client(
+    handler, redis_conn
+):
+    async def no_connection():
+        return None
+
+    handler.redis_manager.get_connection = no_connection
+    await handler._update_status(TradingBot())
+
+    await handler._flush_status()
+
+    assert handler._status_dirty.is_set()
+    assert await redis_conn.hgetall("bot_status") == {}
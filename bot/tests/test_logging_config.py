@@ -0,0 +1,58 @@
+import io
+import logging
+import time
+
+import pytest
+from logging_config import _BufferedStreamHandler
+
+
+@pytest.fixture
+def stream():
+    return io.TextIOWrapper(io.BufferedWriter(io.BytesIO(), buffer_size=64 * 1024))
+
+
+def _written(stream) -> bytes:
+    return stream.buffer.raw.getvalue()
+
+
+def _record(level: int, msg: str) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 1, msg, None, None)
+
+
+def test_records_stay_buffered_until_the_timer_flushes(stream):
+    handler = _BufferedStreamHandler(stream, flush_interval=0.1)
+
+    handler.handle(_record(logging.INFO, "started"))
+    assert _written(stream) == b""
+
+    for _ in range(100):
+        if _written(stream):
+            break
+        time.sleep(0.01)
+
+    assert _written(stream) == b"started\n"
+    assert handler._flush_timer is None
+
+
+def test_one_timer_covers_a_burst_of_records(stream):
+    handler = _BufferedStreamHandler(stream, flush_interval=10)
+
+    handler.handle(_record(logging.INFO, "one"))
+    timer = handler._flush_timer
+    handler.handle(_record(logging.INFO, "two"))
+
+    assert handler._flush_timer is timer
+    handler.flush()
+    assert _written(stream) == b"one\ntwo\n"
+    assert handler._flush_timer is None
+    assert timer.finished.is_set()  # cancelled
+
+
+def test_warning_flushes_earlier_records(stream):
+    handler = _BufferedStreamHandler(stream, flush_interval=10)
+    handler.addFilter(lambda record: record.levelno < logging.WARNING)
+
+    handler.handle(_record(logging.INFO, "before"))
+    handler.handle(_record(logging.WARNING, "warning"))
+
+    assert _written(stream) == b"before\n"